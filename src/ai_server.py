@@ -1,16 +1,17 @@
 # ai_server.py (포트 8001번 서버)
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from contextlib import asynccontextmanager
 import shutil
 import os
+import threading
+from urllib.parse import quote
 from document_processor import DocumentProcessor
+from resultStore import ResultStore, RangeNotSatisfiable, parse_range
 import uvicorn
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 
-app = FastAPI(title="Document Processing API",
-              description="API for processing PDF documents with OCR and LLM")
-
 # 디렉토리 경로 설정
 ORIGINAL_DIR = './data/original'
 CONVERTED_DIR = './data/converted'
@@ -21,21 +22,115 @@ os.makedirs(ORIGINAL_DIR, exist_ok=True)
 os.makedirs(CONVERTED_DIR, exist_ok=True)
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
-# 프로세서 초기화 (CPU 모드로 시작)
-processor = DocumentProcessor(
-    original_dir=ORIGINAL_DIR,
-    converted_dir=CONVERTED_DIR,
-    results_dir=RESULTS_DIR,
-    # use_gpu=False  # GPU 메모리 문제로 기본값은 False
-)
+# 서버 시작 시 모델을 백그라운드에서 미리 로드할지 여부 ("0"이면 첫 요청 때 로드)
+PRELOAD_MODELS = os.environ.get("PRELOAD_MODELS", "1") != "0"
+
+# 결과 보존 정책 (비워두면 해당 제한 없음)
+RESULT_MAX_VERSIONS = int(os.environ.get("RESULT_MAX_VERSIONS", "3"))
+RESULT_MAX_AGE_DAYS = float(os.environ["RESULT_MAX_AGE_DAYS"]) if os.environ.get("RESULT_MAX_AGE_DAYS") else None
+RESULT_MAX_TOTAL_MB = float(os.environ["RESULT_MAX_TOTAL_MB"]) if os.environ.get("RESULT_MAX_TOTAL_MB") else None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the document processor when the server starts.
+    
+    Model loading is deferred to a background thread so the server
+    answers requests immediately; /ready reports when it has finished.
+    """
+    # 저장소가 처음 만들어질 때 RESULTS_DIR 의 기존 .md 결과를 가져옴
+    app.state.result_store = ResultStore(
+        os.path.join(RESULTS_DIR, 'results.db'),
+        max_versions=RESULT_MAX_VERSIONS,
+        max_age_days=RESULT_MAX_AGE_DAYS,
+        max_total_bytes=int(RESULT_MAX_TOTAL_MB * 1024 * 1024) if RESULT_MAX_TOTAL_MB is not None else None,
+        import_dir=RESULTS_DIR
+    )
+    
+    # 프로세서 초기화 (CPU 모드로 시작) - 엔진은 첫 사용 시 로드됨
+    app.state.processor = DocumentProcessor(
+        original_dir=ORIGINAL_DIR,
+        converted_dir=CONVERTED_DIR,
+        results_dir=RESULTS_DIR,
+        result_store=app.state.result_store,
+        # use_gpu=False  # GPU 메모리 문제로 기본값은 False
+    )
+    
+    if PRELOAD_MODELS:
+        def _preload():
+            try:
+                app.state.processor.load_models()
+            except Exception as e:
+                print(f"모델 로드 중 오류가 발생했습니다: {str(e)}")
+        
+        threading.Thread(target=_preload, name="model-preload", daemon=True).start()
+    
+    yield
+
+
+app = FastAPI(title="Document Processing API",
+              description="API for processing PDF documents with OCR and LLM",
+              lifespan=lifespan)
 
 class ProcessResponse(BaseModel):
     success: bool
     message: str
     result_file: Optional[str] = None
 
+class ReadyResponse(BaseModel):
+    ready: bool
+    models: Dict[str, bool]
+    error: Optional[str] = None
+
+class PageInfo(BaseModel):
+    page_no: int
+    page_name: str
+    ocr_etag: Optional[str] = None
+    llm_etag: Optional[str] = None
+
+class PagesResponse(BaseModel):
+    result_file: str
+    etag: str
+    pages: List[PageInfo]
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match covers the given ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+def _result_headers(etag: str, filename: Optional[str] = None) -> Dict[str, str]:
+    headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+    if filename is not None:
+        headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quote(filename)}"
+    return headers
+
+def _content_response(request: Request, data: bytes, etag: str, filename: Optional[str] = None) -> Response:
+    """Serve data with single byte-range support"""
+    headers = _result_headers(etag, filename)
+    media_type = "text/markdown; charset=utf-8"
+    
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, len(data))
+        except RangeNotSatisfiable as e:
+            raise HTTPException(status_code=416, detail="Requested range not satisfiable",
+                                headers={"Content-Range": str(e)})
+        if byte_range is not None:
+            first, last = byte_range
+            headers["Content-Range"] = f"bytes {first}-{last}/{len(data)}"
+            return Response(content=data[first:last + 1], status_code=206,
+                            media_type=media_type, headers=headers)
+    
+    return Response(content=data, media_type=media_type, headers=headers)
+
 @app.post("/process/", response_model=ProcessResponse)
-async def process_document(
+def process_document(
+    request: Request,
     file: UploadFile = File(...),
     source_type: str = Form(...)  # "운용지시서" or "계약서"
 ):
@@ -45,7 +140,7 @@ async def process_document(
     - **file**: PDF file to process
     - **source_type**: Document type ("운용지시서" or "계약서")
     
-    Returns the path to the result file
+    Returns the name of the result file
     """
     # Validate source type
     if source_type not in ["운용지시서", "계약서"]:
@@ -64,32 +159,103 @@ async def process_document(
             shutil.copyfileobj(file.file, buffer)
         
         # Process the document
-        result_file = processor.process_document(file.filename, source_type)
-        
-        # 전체 경로가 아닌 파일명만 반환
-        result_filename = os.path.basename(result_file)
+        processor = request.app.state.processor
+        result_name = processor.process_document(file.filename, source_type)
         
         return ProcessResponse(
             success=True,
             message=f"{source_type} 처리가 완료되었습니다.",
-            result_file=result_filename
+            result_file=result_name
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
 @app.get("/results/{filename}")
-async def get_result(filename: str):
+def get_result(request: Request, filename: str):
     """
-    Download a specific result file.
+    Download the latest version of a result.
     
     - **filename**: Name of the result file
+    
+    Supports `If-None-Match` (304 when unchanged) and a single
+    `Range: bytes=start-end` (206 partial content).
+    """
+    store = request.app.state.result_store
+    
+    # 304 는 인덱스의 ETag 만으로 응답 (본문 읽기/압축 해제 없음)
+    etag = store.get_etag(filename)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Result file not found")
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=_result_headers(etag, filename))
+    
+    found = store.get_content(filename)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Result file not found")
+    
+    data, etag = found
+    return _content_response(request, data, etag, filename=filename)
+
+@app.get("/results/{filename}/pages", response_model=PagesResponse)
+def list_result_pages(request: Request, filename: str):
     """
-    file_path = os.path.join(RESULTS_DIR, filename)
+    List the pages of a result with per-page ETags.
     
-    if not os.path.exists(file_path):
+    - **filename**: Name of the result file
+    """
+    store = request.app.state.result_store
+    etag = store.get_etag(filename)
+    pages = store.list_pages(filename)
+    if etag is None or pages is None:
         raise HTTPException(status_code=404, detail="Result file not found")
     
-    return FileResponse(file_path, media_type="text/markdown", filename=filename)
+    return PagesResponse(result_file=filename, etag=etag, pages=pages)
+
+@app.get("/results/{filename}/pages/{page_no}")
+def get_result_page(request: Request, filename: str, page_no: int, kind: str = "llm"):
+    """
+    Download one page of a result.
+    
+    - **filename**: Name of the result file
+    - **page_no**: Zero-based page number
+    - **kind**: "llm" for the LLM output or "ocr" for the OCR text
+    """
+    if kind not in ["llm", "ocr"]:
+        raise HTTPException(status_code=400, detail="Invalid kind. Must be 'llm' or 'ocr'")
+    
+    store = request.app.state.result_store
+    
+    etag = store.get_page_etag(filename, page_no, kind)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Result page not found")
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=_result_headers(etag))
+    
+    found = store.get_page(filename, page_no, kind)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Result page not found")
+    
+    data, etag = found
+    return _content_response(request, data, etag)
+
+@app.get("/ready", response_model=ReadyResponse)
+def read_ready(request: Request):
+    """
+    Report which models are loaded.
+    
+    With PRELOAD_MODELS enabled, returns 200 once every model is loaded
+    and 503 otherwise. With it disabled, models load on the first
+    request, so the server is ready as soon as it starts.
+    """
+    processor = request.app.state.processor
+    models = processor.loaded_models()
+    body = ReadyResponse(
+        ready=all(models.values()) if PRELOAD_MODELS else True,
+        models=models,
+        error=processor.load_error
+    )
+    status_code = 200 if body.ready else 503
+    return JSONResponse(status_code=status_code, content=body.model_dump())
 
 @app.get("/")
 def read_root():
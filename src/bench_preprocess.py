@@ -0,0 +1,101 @@
+# bench_preprocess.py
+"""
+OCR benchmark with and without image preprocessing
+
+각 페이지 이미지에 대해 전처리 없이 / 전처리 후 OCR 시간을 측정하고 정확도를 비교합니다.
+정답 텍스트 디렉토리(--gt-dir, 파일명: {이미지 이름}.txt)가 있으면 정답과 비교하고,
+없으면 전처리 없는 결과를 기준으로 일치율을 계산합니다.
+"""
+import argparse
+import difflib
+import os
+import time
+
+from imagePreprocessor import ImagePreprocessor
+from ocrEngine import PaddleEngine
+
+
+def char_accuracy(reference, hypothesis):
+    """Character-level similarity between two texts (0.0 ~ 1.0)"""
+    reference = "".join(reference.split())
+    hypothesis = "".join(hypothesis.split())
+    if not reference and not hypothesis:
+        return 1.0
+    return difflib.SequenceMatcher(None, reference, hypothesis, autojunk=False).ratio()
+
+
+def run_once(engine, img_path):
+    """Run OCR once and return (text, elapsed seconds)"""
+    start = time.perf_counter()
+    result, _ = engine.run_ocr(img_path)
+    elapsed = time.perf_counter() - start
+    text = engine.get_text_from_result(result) if result else ""
+    return text, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR with and without preprocessing")
+    parser.add_argument("--image-dir", default="./data/converted", help="Directory of page PNG files")
+    parser.add_argument("--gt-dir", default=None, help="Directory of ground-truth {name}.txt files")
+    parser.add_argument("--gpu", action="store_true", help="Use GPU for OCR")
+    args = parser.parse_args()
+
+    images = sorted(
+        os.path.join(args.image_dir, name)
+        for name in os.listdir(args.image_dir)
+        if name.lower().endswith(".png")
+    )
+    if not images:
+        print(f"이미지 파일이 없습니다: {args.image_dir}")
+        return
+
+    # 같은 모델을 공유하고 전처리기만 바꿔가며 측정
+    engine = PaddleEngine(use_gpu=args.gpu, lang="korean")
+    preprocessor = ImagePreprocessor()
+
+    # 워밍업 (첫 호출의 초기화 비용 제외)
+    run_once(engine, images[0])
+
+    totals = {"raw": 0.0, "preprocessed": 0.0}
+    accuracies = {"raw": [], "preprocessed": []}
+    rows = []
+    for img_path in images:
+        engine.preprocessor = None
+        raw_text, raw_time = run_once(engine, img_path)
+        engine.preprocessor = preprocessor
+        pre_text, pre_time = run_once(engine, img_path)
+
+        name = os.path.splitext(os.path.basename(img_path))[0]
+        gt_path = os.path.join(args.gt_dir, f"{name}.txt") if args.gt_dir else None
+        if gt_path and os.path.exists(gt_path):
+            with open(gt_path, encoding="utf-8") as f:
+                reference = f.read()
+            raw_acc = char_accuracy(reference, raw_text)
+        else:
+            # 정답이 없으면 전처리 없는 결과를 기준으로 삼음
+            reference = raw_text
+            raw_acc = 1.0
+        pre_acc = char_accuracy(reference, pre_text)
+
+        totals["raw"] += raw_time
+        totals["preprocessed"] += pre_time
+        accuracies["raw"].append(raw_acc)
+        accuracies["preprocessed"].append(pre_acc)
+        rows.append((name, raw_time, pre_time, raw_acc, pre_acc))
+
+    print(f"{'page':<30} {'raw(s)':>8} {'pre(s)':>8} {'raw acc':>8} {'pre acc':>8}")
+    for name, raw_time, pre_time, raw_acc, pre_acc in rows:
+        print(f"{name:<30} {raw_time:>8.2f} {pre_time:>8.2f} {raw_acc:>8.3f} {pre_acc:>8.3f}")
+
+    count = len(rows)
+    print()
+    print(f"total OCR time:   raw {totals['raw']:.2f}s, preprocessed {totals['preprocessed']:.2f}s "
+          f"(x{totals['raw'] / max(totals['preprocessed'], 1e-9):.2f})")
+    print(f"mean accuracy:    raw {sum(accuracies['raw']) / count:.3f}, "
+          f"preprocessed {sum(accuracies['preprocessed']) / count:.3f}")
+    if not args.gt_dir:
+        print("(정답 텍스트가 없어 전처리 없는 결과 대비 일치율을 표시합니다)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# bench_startup.py
+"""
+Startup benchmark for the API server
+
+Measures, from process launch:
+  - import time of ai_server (새 인터프리터에서 import 하는 시간)
+  - time-to-first-request: GET / 가 처음 응답할 때까지
+  - time-to-healthy: GET /ready 가 200을 반환할 때까지 (모든 모델 로드 완료)
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def measure_import_time():
+    """Time `import ai_server` in a fresh interpreter"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import ai_server"], check=True)
+    return time.perf_counter() - start
+
+
+def get_status(url):
+    """Return the HTTP status of url, or None if the server is not up yet"""
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return None
+
+
+def measure_server(port, timeout, preload):
+    """Launch uvicorn and poll / and /ready until both succeed"""
+    env = {**os.environ, "PRELOAD_MODELS": "1" if preload else "0"}
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "ai_server:app",
+         "--host", "127.0.0.1", "--port", str(port)],
+        env=env,
+    )
+
+    first_request = None
+    healthy = None
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"서버가 종료되었습니다 (exit code {server.returncode})")
+            if first_request is None and get_status(f"{base_url}/") == 200:
+                first_request = time.perf_counter() - start
+            if first_request is not None and get_status(f"{base_url}/ready") == 200:
+                healthy = time.perf_counter() - start
+                break
+            time.sleep(0.05)
+    finally:
+        server.terminate()
+        server.wait()
+
+    return first_request, healthy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API server startup time")
+    parser.add_argument("--port", type=int, default=8011, help="Port to run the server on")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for /ready")
+    parser.add_argument("--no-preload", action="store_true",
+                        help="Start without background model loading (PRELOAD_MODELS=0)")
+    args = parser.parse_args()
+
+    import_time = measure_import_time()
+    print(f"import ai_server:        {import_time:.2f}s")
+
+    first_request, healthy = measure_server(args.port, args.timeout, not args.no_preload)
+    if first_request is None:
+        print("time-to-first-request:  timeout")
+    else:
+        print(f"time-to-first-request:  {first_request:.2f}s")
+    if healthy is None:
+        print("time-to-healthy:        timeout (모델이 아직 로드되지 않았습니다)")
+    else:
+        print(f"time-to-healthy:        {healthy:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
 # document_processor.py
-from ocrEngine import PaddleEngine
-from llmEngine import Gemma3Engine
-from imageConverter import PDFtoPNG
+# 무거운 의존성(paddleocr, transformers, torch, pdf2image)은 엔진을 처음 사용할 때 import 함
 import os
+import threading
 from typing import List, Dict, Any, Optional
+from resultStore import ResultStore
 
 
 class DocumentProcessor:
@@ -11,7 +11,9 @@ class DocumentProcessor:
                  converted_dir: str = './data/converted',
                  results_dir: str = './data/results',
                  use_gpu: bool = True,
-                 language: str = "korean"):
+                 language: str = "korean",
+                 preprocess: bool = False,
+                 result_store: Optional[ResultStore] = None):
         """
         Initialize the document processor with necessary components
         
@@ -21,18 +23,100 @@ class DocumentProcessor:
             results_dir: Directory for processing results
             use_gpu: Whether to use GPU for OCR
             language: Language for OCR processing
+            preprocess: Whether to trim, deskew, downscale and binarize pages before OCR
+                (off until bench_preprocess.py shows it helps on our documents)
+            result_store: Store for results, defaults to results.db in results_dir
+                (existing .md results there are imported when it is created)
         """
         self.original_dir = original_dir
         self.converted_dir = converted_dir
         self.results_dir = results_dir
+        self.use_gpu = use_gpu
+        self.language = language
+        self.preprocess = preprocess
         
-        # Initialize components
-        self.ocr_engine = PaddleEngine(use_gpu=use_gpu, lang=language)
-        self.llm_engine = Gemma3Engine()
-        self.image_converter = PDFtoPNG(original_dir, converted_dir)
+        # Components are constructed lazily on first access, each behind its
+        # own lock so loading one engine does not block access to the others
+        self._ocr_engine = None
+        self._llm_engine = None
+        self._image_converter = None
+        self._locks = {name: threading.Lock() for name in ("ocr", "llm", "image_converter")}
+        self.load_error: Optional[str] = None
+        # PaddleOCR predictor is not thread-safe and Gemma3 shares one GPU,
+        # so documents are processed one at a time
+        self._inference_lock = threading.Lock()
         
         # Create results directory if it doesn't exist
         os.makedirs(self.results_dir, exist_ok=True)
+        
+        if result_store is None:
+            result_store = ResultStore(os.path.join(self.results_dir, 'results.db'),
+                                       import_dir=self.results_dir)
+        self.result_store = result_store
+    
+    def _load(self, name: str, attr: str, factory):
+        """Construct a component once, recording the last load error"""
+        if getattr(self, attr) is None:
+            with self._locks[name]:
+                if getattr(self, attr) is None:
+                    try:
+                        setattr(self, attr, factory())
+                    except Exception as e:
+                        self.load_error = f"{name}: {str(e)}"
+                        raise
+                    self.load_error = None
+        return getattr(self, attr)
+    
+    def _create_ocr_engine(self):
+        from ocrEngine import PaddleEngine
+        preprocessor = None
+        if self.preprocess:
+            # cv2 는 전처리를 사용할 때만 import
+            from imagePreprocessor import ImagePreprocessor
+            preprocessor = ImagePreprocessor()
+        return PaddleEngine(use_gpu=self.use_gpu, lang=self.language, preprocessor=preprocessor)
+    
+    def _create_llm_engine(self):
+        from llmEngine import Gemma3Engine
+        return Gemma3Engine()
+    
+    def _create_image_converter(self):
+        from imageConverter import PDFtoPNG
+        return PDFtoPNG(self.original_dir, self.converted_dir)
+    
+    @property
+    def ocr_engine(self):
+        """PaddleOCR engine, loaded on first access"""
+        return self._load("ocr", "_ocr_engine", self._create_ocr_engine)
+    
+    @property
+    def llm_engine(self):
+        """Gemma3 engine, loaded on first access"""
+        return self._load("llm", "_llm_engine", self._create_llm_engine)
+    
+    @property
+    def image_converter(self):
+        """PDF to PNG converter, loaded on first access"""
+        return self._load("image_converter", "_image_converter", self._create_image_converter)
+    
+    def load_models(self) -> None:
+        """Eagerly construct all components (used for server warm-up)"""
+        self.image_converter
+        self.ocr_engine
+        self.llm_engine
+    
+    def loaded_models(self) -> Dict[str, bool]:
+        """
+        Report which components have been constructed
+        
+        Returns:
+            Mapping of component name to whether it is loaded
+        """
+        return {
+            "ocr": self._ocr_engine is not None,
+            "llm": self._llm_engine is not None,
+            "image_converter": self._image_converter is not None,
+        }
     
     def process_document(self, pdf_filename: str, source_type: str) -> str:
         """
@@ -43,25 +127,27 @@ class DocumentProcessor:
             source_type: Type of document ("운용지시서" or "계약서")
             
         Returns:
-            Path to the output result file
+            Name of the result in the result store
         """
-        # Convert PDF to PNG
-        converted_files = self.image_converter.convert_one_pdf(pdf_filename)
-        
-        # Process based on document type
-        if source_type == "운용지시서":
-            return self._process_operation_instruction(pdf_filename, converted_files)
-        elif source_type == "계약서":
-            return self._process_contract(pdf_filename, converted_files)
-        else:
+        if source_type not in ("운용지시서", "계약서"):
             raise ValueError(f"Unsupported document type: {source_type}")
+        
+        with self._inference_lock:
+            # Convert PDF to PNG
+            converted_files = self.image_converter.convert_one_pdf(pdf_filename)
+            
+            # Process based on document type
+            if source_type == "운용지시서":
+                return self._process_operation_instruction(pdf_filename, converted_files)
+            else:
+                return self._process_contract(pdf_filename, converted_files)
     
     def _process_operation_instruction(self, pdf_filename: str, converted_files: List[str]) -> str:
         """Process operation instruction document type"""
         # Extract text from each page using OCR
         ocr_results = {}
         for file_path in converted_files:
-            ocr_result = self.ocr_engine.process_image(file_path)
+            ocr_result = self.ocr_engine.process_image(file_path, save_text=False)
             ocr_results[file_path] = ocr_result
         
         # Process each page with LLM
@@ -70,37 +156,42 @@ class DocumentProcessor:
             llm_result = self.llm_engine.run(ocrresult=ocr_result["text"], source="운용지시서")
             result_dic[file_path] = llm_result
         
-        # Save results to file
+        # Save results to the result store
         base_filename = os.path.splitext(os.path.basename(pdf_filename))[0]
-        output_file = os.path.join(self.results_dir, f'{base_filename}_운용지시서_결과.md')
+        result_name = f'{base_filename}_운용지시서_결과.md'
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for file_path, result in result_dic.items():
-                page_name = os.path.basename(file_path)
-                f.write(f"## {page_name}\n\n")
-                f.write(result)
-                f.write("\n\n---\n\n")  # Page separator
+        content = ""
+        pages = []
+        for file_path, result in result_dic.items():
+            page_name = os.path.basename(file_path)
+            content += f"## {page_name}\n\n{result}\n\n---\n\n"  # Page separator
+            pages.append({
+                "page_name": page_name,
+                "ocr_text": ocr_results[file_path].get("text"),
+                "llm_output": result
+            })
         
-        return output_file
+        self.result_store.save_result(result_name, pdf_filename, "운용지시서", content, pages)
+        return result_name
     
     def _process_contract(self, pdf_filename: str, converted_files: List[str]) -> str:
         """Process contract document type"""
         # Combine all text from all pages
         ocr_results = ""
+        pages = []
         for file_path in converted_files:
-            result = self.ocr_engine.process_image(file_path)
+            result = self.ocr_engine.process_image(file_path, save_text=False)
             # Only add if successful
             if result["success"]:
                 ocr_results += result["text"] + "\n\n"
+            pages.append({"page_name": os.path.basename(file_path), "ocr_text": result.get("text")})
         
         # Process combined text with LLM
         llm_result = self.llm_engine.run(ocrresult=ocr_results, source="계약서")
         
-        # Save result to file
+        # Save result to the result store (the LLM output covers all pages combined)
         base_filename = os.path.splitext(os.path.basename(pdf_filename))[0]
-        output_file = os.path.join(self.results_dir, f'{base_filename}_계약서_결과.md')
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(llm_result)
+        result_name = f'{base_filename}_계약서_결과.md'
         
-        return output_file
\ No newline at end of file
+        self.result_store.save_result(result_name, pdf_filename, "계약서", llm_result, pages)
+        return result_name
\ No newline at end of file
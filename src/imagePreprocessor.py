@@ -0,0 +1,198 @@
+import cv2
+import numpy as np
+
+
+class ImagePreprocessor:
+    def __init__(self, trim_margins=True, deskew=True, downscale=True, binarize=True,
+                 target_text_height=48, ink_threshold=200, margin_padding=10,
+                 max_skew_angle=10.0, min_skew_angle=0.1, threshold_block_size=31,
+                 threshold_offset=10):
+        """
+        OCR 전처리기 초기화 (여백 제거, 기울기 보정, 축소, 이진화)
+
+        Args:
+            trim_margins (bool): 텍스트가 없는 여백 제거 여부
+            deskew (bool): 기울기 보정 여부
+            downscale (bool): 글자 높이에 맞춘 축소 여부
+            binarize (bool): 적응형 이진화 여부
+            target_text_height (int): 축소 후 목표 글자 높이 (px), PaddleOCR 인식 입력 높이(48)보다 작으면 다시 확대됨
+            ink_threshold (int): 이 값보다 어두운 픽셀을 글자로 간주
+            margin_padding (int): 여백 제거 후 남겨둘 여유 픽셀
+            max_skew_angle (float): 보정할 최대 기울기 (도), 넘으면 추정 실패로 간주
+            min_skew_angle (float): 이보다 작은 기울기는 무시 (도)
+            threshold_block_size (int): 적응형 이진화의 이웃 영역 크기 (홀수)
+            threshold_offset (int): 적응형 이진화에서 평균에서 뺄 값, 클수록 옅은 글자가 사라짐
+        """
+        self.trim_margins = trim_margins
+        self.deskew = deskew
+        self.downscale = downscale
+        self.binarize = binarize
+        self.target_text_height = target_text_height
+        self.ink_threshold = ink_threshold
+        self.margin_padding = margin_padding
+        self.max_skew_angle = max_skew_angle
+        self.min_skew_angle = min_skew_angle
+        self.threshold_block_size = threshold_block_size
+        self.threshold_offset = threshold_offset
+
+    def ink_mask(self, gray):
+        """
+        글자(잉크) 픽셀 마스크 생성
+
+        Args:
+            gray (np.ndarray): 그레이스케일 이미지
+
+        Returns:
+            np.ndarray: 글자 픽셀이면 True 인 bool 배열
+        """
+        return gray < self.ink_threshold
+
+    def find_content_box(self, mask):
+        """
+        글자가 있는 영역의 경계 상자 계산
+
+        Args:
+            mask (np.ndarray): 글자 픽셀 마스크
+
+        Returns:
+            tuple: (x0, y0, x1, y1), 글자가 없으면 None
+        """
+        height, width = mask.shape
+        # 잡티를 무시하기 위해 일정 개수 이상의 글자 픽셀이 있는 행/열만 사용
+        rows = np.flatnonzero(mask.sum(axis=1) > max(1, width // 500))
+        cols = np.flatnonzero(mask.sum(axis=0) > max(1, height // 500))
+        if rows.size == 0 or cols.size == 0:
+            return None
+
+        pad = self.margin_padding
+        x0 = max(0, int(cols[0]) - pad)
+        y0 = max(0, int(rows[0]) - pad)
+        x1 = min(width, int(cols[-1]) + pad + 1)
+        y1 = min(height, int(rows[-1]) + pad + 1)
+        return x0, y0, x1, y1
+
+    def estimate_skew(self, mask):
+        """
+        글자 픽셀 분포로 기울기 추정
+
+        Args:
+            mask (np.ndarray): 글자 픽셀 마스크
+
+        Returns:
+            float: 기울기 (도, 반시계 방향 회전 시 보정됨), 보정할 필요가 없으면 0.0
+        """
+        ys, xs = np.nonzero(mask)
+        if xs.size < 100:
+            return 0.0
+
+        # 점이 많으면 minAreaRect 계산량을 줄이기 위해 샘플링
+        step = max(1, xs.size // 200000)
+        points = np.column_stack((xs[::step], ys[::step])).astype(np.float32)
+        angle = cv2.minAreaRect(points)[-1]
+
+        # OpenCV 버전에 따라 각도 범위가 [-90, 0) 또는 (0, 90] 이므로 [-45, 45] 로 정규화
+        if angle > 45:
+            angle -= 90
+        elif angle < -45:
+            angle += 90
+
+        if abs(angle) < self.min_skew_angle or abs(angle) > self.max_skew_angle:
+            return 0.0
+        return float(angle)
+
+    def estimate_text_height(self, mask):
+        """
+        연결 요소의 높이 중앙값으로 글자 높이 추정
+
+        Args:
+            mask (np.ndarray): 글자 픽셀 마스크
+
+        Returns:
+            float: 글자 높이 (px), 추정할 수 없으면 None
+        """
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask.astype(np.uint8), connectivity=8)
+        heights = stats[1:count, cv2.CC_STAT_HEIGHT]
+        areas = stats[1:count, cv2.CC_STAT_AREA]
+        # 잡티와 표 테두리 같은 큰 요소 제외
+        valid = (heights >= 4) & (areas >= 8) & (heights < mask.shape[0] // 10)
+        if not np.any(valid):
+            return None
+        return float(np.median(heights[valid]))
+
+    def preprocess(self, image):
+        """
+        OCR 입력 이미지 전처리
+
+        Args:
+            image (np.ndarray): BGR 또는 그레이스케일 이미지
+
+        Returns:
+            tuple: (전처리된 BGR 이미지, 전처리 좌표를 원본 좌표로 변환하는 2x3 아핀 행렬)
+        """
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        # 원본 -> 전처리 좌표 변환 (3x3 동차 좌표)
+        transform = np.eye(3)
+
+        # 1. 여백 제거
+        if self.trim_margins:
+            box = self.find_content_box(self.ink_mask(gray))
+            if box is not None:
+                x0, y0, x1, y1 = box
+                gray = gray[y0:y1, x0:x1]
+                transform = np.array([[1, 0, -x0], [0, 1, -y0], [0, 0, 1]], dtype=np.float64) @ transform
+
+        # 2. 기울기 보정 (잘리지 않도록 캔버스 확장)
+        if self.deskew:
+            angle = self.estimate_skew(self.ink_mask(gray))
+            if angle != 0.0:
+                height, width = gray.shape
+                rotation = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+                cos, sin = abs(rotation[0, 0]), abs(rotation[0, 1])
+                new_width = int(np.ceil(height * sin + width * cos))
+                new_height = int(np.ceil(height * cos + width * sin))
+                rotation[0, 2] += new_width / 2 - width / 2
+                rotation[1, 2] += new_height / 2 - height / 2
+                gray = cv2.warpAffine(gray, rotation, (new_width, new_height),
+                                      flags=cv2.INTER_LINEAR, borderValue=255)
+                transform = np.vstack([rotation, [0, 0, 1]]) @ transform
+
+        # 3. 글자 높이에 맞춰 축소 (확대는 하지 않음)
+        if self.downscale:
+            text_height = self.estimate_text_height(self.ink_mask(gray))
+            if text_height is not None and text_height > self.target_text_height:
+                scale = self.target_text_height / text_height
+                height, width = gray.shape
+                gray = cv2.resize(gray, (max(1, round(width * scale)), max(1, round(height * scale))),
+                                  interpolation=cv2.INTER_AREA)
+                # 실제 크기는 반올림되므로 축별 배율을 다시 계산
+                scale_x = gray.shape[1] / width
+                scale_y = gray.shape[0] / height
+                transform = np.diag([scale_x, scale_y, 1.0]) @ transform
+
+        # 4. 적응형 이진화
+        if self.binarize:
+            gray = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                         cv2.THRESH_BINARY, self.threshold_block_size,
+                                         self.threshold_offset)
+
+        processed = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+        to_original = np.linalg.inv(transform)[:2]
+        return processed, to_original
+
+    def map_boxes_to_original(self, result, to_original):
+        """
+        OCR 결과의 박스 좌표를 원본 이미지 좌표로 변환
+
+        Args:
+            result (list): PaddleOCR 결과 ([box, (text, score)] 목록)
+            to_original (np.ndarray): preprocess 가 반환한 2x3 아핀 행렬
+
+        Returns:
+            list: 박스 좌표가 원본 기준으로 변환된 OCR 결과
+        """
+        if not result:
+            return result
+
+        boxes = np.array([line[0] for line in result], dtype=np.float64)  # (N, 4, 2)
+        mapped = boxes @ to_original[:, :2].T + to_original[:, 2]
+        return [[box.tolist(), line[1]] for box, line in zip(mapped, result)]
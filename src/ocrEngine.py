@@ -4,7 +4,7 @@ from PIL import Image
 import numpy as np
 # TODO : Table Recognition 해서 테이블 좌표값들을 받아와서 해당 좌표값에 맞게 원본 이미지를 각 테이블별로 crop하는 로직 추가되면 좋을것 같음.
 class PaddleEngine:
-    def __init__(self, use_gpu=True, lang="korean", font_path='./paddleocr/korean.ttf'):
+    def __init__(self, use_gpu=True, lang="korean", font_path='./paddleocr/korean.ttf', preprocessor=None):
         """
         PaddleOCR 엔진 초기화
         
@@ -12,10 +12,12 @@ class PaddleEngine:
             use_gpu (bool): GPU 사용 여부
             lang (str): 사용할 언어 (korean, en 등)
             font_path (str): 시각화에 사용할 폰트 경로
+            preprocessor (ImagePreprocessor, optional): OCR 전 이미지 전처리기, 없으면 원본 이미지 사용
         """
         self.use_gpu = use_gpu
         self.lang = lang
         self.font_path = font_path
+        self.preprocessor = preprocessor
         self.ocr = PaddleOCR(use_gpu=self.use_gpu, lang=self.lang)
         self.output_dir = './workspace'
         
@@ -79,25 +81,33 @@ class PaddleEngine:
             img_path (str): 이미지 파일 경로
             
         Returns:
-            list: OCR 결과
-            None: 실패 시
+            tuple: (OCR 결과 list, 이미지 경로), 인식된 텍스트가 없으면 OCR 결과는 None
         """
         # 이미지 경로 확인
         valid_path = self.verify_image_path(img_path)
         if not valid_path:
             raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {img_path}")
         
-        # OCR 실행
-        result = self.ocr.ocr(valid_path)
+        # OCR 실행 (전처리기가 있으면 전처리된 이미지 사용)
+        if self.preprocessor is not None:
+            image = np.array(Image.open(valid_path).convert('L'))
+            image, to_original = self.preprocessor.preprocess(image)
+            result = self.ocr.ocr(image)
+        else:
+            result = self.ocr.ocr(valid_path)
         
         # 결과가 비어있는지 확인
         if not result or not result[0]:
             print("인식된 텍스트가 없습니다.")
-            return None
+            return None, valid_path
         
         # 첫 번째 페이지 결과 가져오기 (PaddleOCR은 여러 페이지를 처리할 수 있음)
         result = result[0]
         
+        # 박스 좌표를 원본 페이지 기준으로 변환
+        if self.preprocessor is not None:
+            result = self.preprocessor.map_boxes_to_original(result, to_original)
+        
         return result, valid_path
     
     def print_ocr_results(self, result):
@@ -172,13 +182,14 @@ class PaddleEngine:
         texts = [line[1][0] for line in result]
         return '\n'.join(texts)
     
-    def process_image(self, img_path, output_base_name=None):
+    def process_image(self, img_path, output_base_name=None, save_text=True):
         """
         이미지 처리 전체 과정 실행 (OCR 실행, 시각화, 텍스트 저장)
         
         Args:
             img_path (str): 이미지 파일 경로
             output_base_name (str, optional): 출력 파일 기본 이름, 없으면 이미지 파일 이름 사용
+            save_text (bool): 인식된 텍스트를 workspace 에 파일로 저장할지 여부
             
         Returns:
             dict: 처리 결과 (텍스트, 시각화 이미지 경로, 텍스트 파일 경로)
@@ -199,7 +210,7 @@ class PaddleEngine:
         # vis_path = self.visualize_result(valid_path, ocr_result, f'{output_base_name}_result')
         
         # 텍스트 저장
-        txt_path = self.save_text_result(ocr_result, f'{output_base_name}_text')
+        txt_path = self.save_text_result(ocr_result, f'{output_base_name}_text') if save_text else None
         
         # 추출된 텍스트
         extracted_text = self.get_text_from_result(ocr_result)
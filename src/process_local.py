@@ -11,15 +11,18 @@ def main():
     parser.add_argument("--type", required=True, choices=["운용지시서", "계약서"], 
                         help="Document type (운용지시서 or 계약서)")
     parser.add_argument("--gpu", action="store_true", help="Use GPU for OCR")
+    parser.add_argument("--preprocess", action="store_true",
+                        help="Preprocess images (margin trim, deskew, downscale, binarize) before OCR")
     
     args = parser.parse_args()
     
     # Initialize processor
-    processor = DocumentProcessor(use_gpu=args.gpu)
+    processor = DocumentProcessor(use_gpu=args.gpu, preprocess=args.preprocess)
     
     # Process document
     try:
-        result_file = processor.process_document(args.pdf, args.type)
+        result_name = processor.process_document(args.pdf, args.type)
+        result_file = processor.result_store.export(result_name, processor.results_dir)
         print(f"처리가 완료되었습니다. 결과 파일: {result_file}")
     except Exception as e:
         print(f"처리 중 오류가 발생했습니다: {str(e)}")
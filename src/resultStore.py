@@ -0,0 +1,580 @@
+# resultStore.py
+import hashlib
+import os
+import re
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# PRAGMA user_version 으로 관리하는 스키마 버전
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    result_name TEXT NOT NULL,
+    pdf_filename TEXT NOT NULL,
+    source_type TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    etag TEXT NOT NULL,
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    content BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_name ON documents (result_name, created_at);
+CREATE INDEX IF NOT EXISTS idx_documents_accessed ON documents (accessed_at);
+
+CREATE TABLE IF NOT EXISTS pages (
+    document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    page_no INTEGER NOT NULL,
+    page_name TEXT NOT NULL,
+    ocr_text BLOB,
+    llm_output BLOB,
+    ocr_etag TEXT,
+    llm_etag TEXT,
+    PRIMARY KEY (document_id, page_no)
+);
+"""
+
+# 결과 파일 이름 규칙: {base}_{type}_결과.md
+RESULT_NAME_PATTERN = re.compile(r'^(?P<base>.+)_(?P<type>운용지시서|계약서)_결과\.md$')
+
+# 운용지시서 결과의 페이지 머리글: "## {base}_{i}.png" (PDFtoPNG 가 만든 페이지 이미지 이름)
+PAGE_HEADER_PATTERN = re.compile(r'^## (?P<name>[^\n]+_\d+\.png)\n\n', re.M)
+PAGE_SEPARATOR = "\n\n---\n\n"
+
+# 페이지 종류별 (본문 컬럼, ETag 컬럼)
+PAGE_COLUMNS = {"llm": ("llm_output", "llm_etag"), "ocr": ("ocr_text", "ocr_etag")}
+
+
+class RangeNotSatisfiable(ValueError):
+    """Raised when a byte range lies entirely outside the content"""
+
+
+def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=start-end" range into inclusive offsets
+
+    Returns None for headers that are malformed or not handled (the full
+    body should be served), and raises RangeNotSatisfiable when the range
+    starts past the end of the content.
+
+    >>> parse_range("bytes=0-9", 120)
+    (0, 9)
+    >>> parse_range("bytes=100-", 120)
+    (100, 119)
+    >>> parse_range("bytes=-20", 120)
+    (100, 119)
+    >>> parse_range("bytes=-500", 120)
+    (0, 119)
+    >>> parse_range("bytes=110-9999", 120)
+    (110, 119)
+    >>> parse_range("bytes=9999-", 120)
+    Traceback (most recent call last):
+    ...
+    resultStore.RangeNotSatisfiable: bytes */120
+    >>> parse_range("bytes=9999-10000", 120)
+    Traceback (most recent call last):
+    ...
+    resultStore.RangeNotSatisfiable: bytes */120
+    >>> parse_range("bytes=-0", 120)
+    Traceback (most recent call last):
+    ...
+    resultStore.RangeNotSatisfiable: bytes */120
+    >>> parse_range("bytes=20-10", 120) is None
+    True
+    >>> parse_range("bytes=abc", 120) is None
+    True
+    >>> parse_range("bytes=0-1,5-6", 120) is None
+    True
+    >>> parse_range("items=0-9", 120) is None
+    True
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    start, sep, end = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        first = int(start) if start else None
+        last = int(end) if end else None
+    except ValueError:
+        return None
+
+    if first is None:
+        # 접미사 범위 ("bytes=-500" = 마지막 500바이트)
+        if last is None:
+            return None
+        if last == 0 or size == 0:
+            raise RangeNotSatisfiable(f"bytes */{size}")
+        return max(0, size - last), size - 1
+
+    if first >= size:
+        raise RangeNotSatisfiable(f"bytes */{size}")
+    if last is None:
+        return first, size - 1
+    if last < first:
+        return None
+    return first, min(last, size - 1)
+
+
+def split_result_pages(content: str) -> List[Tuple[str, str]]:
+    """
+    Split a 운용지시서 result into (page_name, llm_output) pairs
+
+    Pages are delimited by their "## {page}.png" headers rather than by
+    the "---" separator, since the LLM output may contain its own rules.
+
+    >>> split_result_pages("## a_0.png\\n\\nfirst\\n\\n---\\n\\nmore\\n\\n---\\n\\n"
+    ...                    "## a_1.png\\n\\nsecond\\n\\n---\\n\\n")
+    [('a_0.png', 'first\\n\\n---\\n\\nmore'), ('a_1.png', 'second')]
+    >>> split_result_pages("no page headers")
+    []
+    """
+    headers = list(PAGE_HEADER_PATTERN.finditer(content))
+    pages = []
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(content)
+        body = content[header.end():end]
+        if body.endswith(PAGE_SEPARATOR):
+            body = body[:-len(PAGE_SEPARATOR)]
+        pages.append((header.group("name"), body))
+    return pages
+
+
+def _compress(text: Optional[str]) -> Optional[bytes]:
+    if text is None:
+        return None
+    return zlib.compress(text.encode('utf-8'), 6)
+
+
+def _decompress(blob: Optional[bytes]) -> Optional[bytes]:
+    if blob is None:
+        return None
+    return zlib.decompress(blob)
+
+
+def make_etag(data: bytes) -> str:
+    """Strong ETag for the given content"""
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+class ResultStore:
+    def __init__(self, db_path: str = './data/results/results.db',
+                 max_versions: int = 3,
+                 max_age_days: Optional[float] = None,
+                 max_total_bytes: Optional[int] = None,
+                 import_dir: Optional[str] = None,
+                 access_update_interval: float = 60.0):
+        """
+        SQLite-backed store for processing results
+
+        Every run is kept as a new version of its result name
+        (e.g. "계약_계약서_결과.md"); reads return the latest version.
+        OCR text, LLM output and the final markdown are stored as
+        zlib-compressed blobs, with ETags kept alongside in the index.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_versions: Number of versions to keep per result name
+            max_age_days: Evict versions older than this (None to disable)
+            max_total_bytes: Evict versions (older versions first, then least
+                recently accessed) until the compressed size of all results is
+                under this; the version just saved is never evicted (None to disable)
+            import_dir: Directory of result .md files written before the
+                store existed; imported once when the database is created
+            access_update_interval: Minimum seconds between accessed_at
+                updates for the same version
+        """
+        self.db_path = db_path
+        self.max_versions = max_versions
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_bytes
+        self.access_update_interval = access_update_interval
+        # 마지막으로 accessed_at 을 기록한 시각 (쓰기 횟수를 줄이기 위함)
+        self._last_touched: Dict[int, float] = {}
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        with self._connect() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            # auto_vacuum 은 테이블 생성 전에 설정해야 하고, 기존 DB 는 VACUUM 후 적용됨
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            if version < SCHEMA_VERSION:
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        if version < SCHEMA_VERSION and import_dir is not None:
+            self.import_directory(import_dir)
+
+    @contextmanager
+    def _connect(self):
+        # 요청마다 연결을 새로 열어 스레드 간 공유 문제를 피함
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _touch(self, conn: sqlite3.Connection, document_id: int) -> None:
+        """Record an access, at most once per access_update_interval"""
+        now = time.time()
+        if now - self._last_touched.get(document_id, 0.0) < self.access_update_interval:
+            return
+        self._last_touched[document_id] = now
+        conn.execute("UPDATE documents SET accessed_at = ? WHERE id = ?", (now, document_id))
+
+    def _insert(self, conn: sqlite3.Connection, result_name: str, pdf_filename: str,
+                source_type: str, content: str, pages: List[Dict[str, Any]],
+                created_at: float) -> int:
+        raw = content.encode('utf-8')
+        blob = zlib.compress(raw, 6)
+        page_rows = []
+        for page_no, page in enumerate(pages):
+            ocr_text = page.get("ocr_text")
+            llm_output = page.get("llm_output")
+            page_rows.append((
+                page_no, page["page_name"], _compress(ocr_text), _compress(llm_output),
+                make_etag(ocr_text.encode('utf-8')) if ocr_text is not None else None,
+                make_etag(llm_output.encode('utf-8')) if llm_output is not None else None,
+            ))
+        # 보존 정책의 용량 계산에는 페이지 데이터까지 포함
+        stored_size = len(blob) + sum(len(row[2] or b'') + len(row[3] or b'') for row in page_rows)
+
+        cursor = conn.execute(
+            "INSERT INTO documents (result_name, pdf_filename, source_type, created_at,"
+            " accessed_at, etag, raw_size, stored_size, content)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (result_name, pdf_filename, source_type, created_at, created_at,
+             make_etag(raw), len(raw), stored_size, blob)
+        )
+        document_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO pages (document_id, page_no, page_name, ocr_text, llm_output, ocr_etag, llm_etag)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(document_id, *row) for row in page_rows]
+        )
+        return document_id
+
+    def save_result(self, result_name: str, pdf_filename: str, source_type: str,
+                    content: str, pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Store a new version of a result and apply the retention policy
+
+        Args:
+            result_name: Name the result is served under
+            pdf_filename: Name of the source PDF file
+            source_type: Type of document ("운용지시서" or "계약서")
+            content: Final markdown result
+            pages: Per-page records with "page_name", "ocr_text" and
+                optionally "llm_output"
+
+        Returns:
+            Metadata of the stored version
+        """
+        with self._connect() as conn:
+            document_id = self._insert(conn, result_name, pdf_filename, source_type,
+                                       content, pages, time.time())
+
+        # 방금 저장한 버전은 용량 제한으로 지우지 않음 (처리 결과가 바로 사라지지 않도록)
+        self.enforce_retention(keep_id=document_id)
+        return self.get_document(result_name)
+
+    def import_directory(self, directory: str) -> int:
+        """
+        Import result .md files written before the store existed
+
+        Files whose name is already in the store, or that do not follow
+        the "{base}_{type}_결과.md" naming, are skipped.
+
+        Returns:
+            Number of imported files
+
+        >>> import tempfile
+        >>> directory = tempfile.mkdtemp()
+        >>> with open(os.path.join(directory, 'a_운용지시서_결과.md'), 'w', encoding='utf-8') as f:
+        ...     _ = f.write("## a_0.png\\n\\nx\\n\\n---\\n\\ny\\n\\n---\\n\\n## a_1.png\\n\\nz\\n\\n---\\n\\n")
+        >>> with open(os.path.join(directory, 'notes.md'), 'w', encoding='utf-8') as f:
+        ...     _ = f.write("not a result")
+        >>> store = ResultStore(os.path.join(directory, 'results.db'), import_dir=directory)  # doctest: +ELLIPSIS
+        기존 결과 파일 1개를 저장소로 가져왔습니다: ...
+        >>> [page["page_name"] for page in store.list_pages('a_운용지시서_결과.md')]
+        ['a_0.png', 'a_1.png']
+        >>> store.get_page('a_운용지시서_결과.md', 0)[0].decode('utf-8')
+        'x\\n\\n---\\n\\ny'
+        >>> store.import_directory(directory)
+        0
+        """
+        if not os.path.isdir(directory):
+            return 0
+
+        imported = 0
+        with self._connect() as conn:
+            known = {row[0] for row in conn.execute("SELECT DISTINCT result_name FROM documents")}
+            for filename in sorted(os.listdir(directory)):
+                match = RESULT_NAME_PATTERN.match(filename)
+                if match is None or filename in known:
+                    continue
+                file_path = os.path.join(directory, filename)
+                with open(file_path, encoding='utf-8') as f:
+                    content = f.read()
+
+                pages = []
+                if match.group("type") == "운용지시서":
+                    pages = [
+                        {"page_name": page_name, "llm_output": llm_output}
+                        for page_name, llm_output in split_result_pages(content)
+                    ]
+                self._insert(conn, filename, f'{match.group("base")}.pdf', match.group("type"),
+                             content, pages, os.path.getmtime(file_path))
+                imported += 1
+
+        if imported:
+            print(f"기존 결과 파일 {imported}개를 저장소로 가져왔습니다: {directory}")
+        return imported
+
+    def get_document(self, result_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Metadata of the latest version of a result
+
+        Returns:
+            Metadata including the page count, or None if not found
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT d.id, d.result_name, d.pdf_filename, d.source_type, d.created_at,"
+                " d.etag, d.raw_size, d.stored_size,"
+                " (SELECT COUNT(*) FROM pages p WHERE p.document_id = d.id) AS page_count"
+                " FROM documents d WHERE d.result_name = ?"
+                " ORDER BY d.created_at DESC, d.id DESC LIMIT 1",
+                (result_name,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_etag(self, result_name: str) -> Optional[str]:
+        """
+        ETag of the latest version of a result, read from the index only
+
+        Returns:
+            ETag, or None if not found
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT etag FROM documents WHERE result_name = ?"
+                " ORDER BY created_at DESC, id DESC LIMIT 1",
+                (result_name,)
+            ).fetchone()
+        return row["etag"] if row else None
+
+    def get_content(self, result_name: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Latest markdown result
+
+        Returns:
+            (content bytes, ETag), or None if not found
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, content, etag FROM documents WHERE result_name = ?"
+                " ORDER BY created_at DESC, id DESC LIMIT 1",
+                (result_name,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._touch(conn, row["id"])
+        return _decompress(row["content"]), row["etag"]
+
+    def get_page_etag(self, result_name: str, page_no: int, kind: str = "llm") -> Optional[str]:
+        """
+        ETag of one page of the latest version, read from the index only
+
+        Returns:
+            ETag, or None if the page or that kind of output does not exist
+        """
+        if kind not in PAGE_COLUMNS:
+            raise ValueError(f"Unsupported page kind: {kind}")
+        _, etag_column = PAGE_COLUMNS[kind]
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT p.{etag_column} AS etag FROM pages p"
+                " WHERE p.page_no = ? AND p.document_id = ("
+                "  SELECT id FROM documents WHERE result_name = ?"
+                "  ORDER BY created_at DESC, id DESC LIMIT 1)",
+                (page_no, result_name)
+            ).fetchone()
+        return row["etag"] if row else None
+
+    def get_page(self, result_name: str, page_no: int, kind: str = "llm") -> Optional[Tuple[bytes, str]]:
+        """
+        One page of the latest version of a result
+
+        Args:
+            result_name: Name of the result
+            page_no: Zero-based page number
+            kind: "llm" for the LLM output or "ocr" for the OCR text
+
+        Returns:
+            (content bytes, ETag), or None if the page or that kind of
+            output does not exist
+        """
+        if kind not in PAGE_COLUMNS:
+            raise ValueError(f"Unsupported page kind: {kind}")
+        data_column, etag_column = PAGE_COLUMNS[kind]
+
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT p.document_id, p.{data_column} AS data, p.{etag_column} AS etag FROM pages p"
+                " WHERE p.page_no = ? AND p.document_id = ("
+                "  SELECT id FROM documents WHERE result_name = ?"
+                "  ORDER BY created_at DESC, id DESC LIMIT 1)",
+                (page_no, result_name)
+            ).fetchone()
+            if row is None or row["data"] is None:
+                return None
+            self._touch(conn, row["document_id"])
+        return _decompress(row["data"]), row["etag"]
+
+    def list_pages(self, result_name: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Pages of the latest version of a result with per-page ETags
+
+        Returns:
+            Page records ("page_no", "page_name", "ocr_etag", "llm_etag"),
+            or None if the result does not exist
+        """
+        with self._connect() as conn:
+            document = conn.execute(
+                "SELECT id FROM documents WHERE result_name = ?"
+                " ORDER BY created_at DESC, id DESC LIMIT 1",
+                (result_name,)
+            ).fetchone()
+            if document is None:
+                return None
+            rows = conn.execute(
+                "SELECT page_no, page_name, ocr_etag, llm_etag FROM pages"
+                " WHERE document_id = ? ORDER BY page_no",
+                (document["id"],)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def export(self, result_name: str, directory: str) -> Optional[str]:
+        """
+        Write the latest version of a result to a markdown file
+
+        Returns:
+            Path to the written file, or None if not found
+        """
+        found = self.get_content(result_name)
+        if found is None:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        output_file = os.path.join(directory, result_name)
+        with open(output_file, 'wb') as f:
+            f.write(found[0])
+        return output_file
+
+    def enforce_retention(self, keep_id: Optional[int] = None) -> int:
+        """
+        Evict old versions according to the retention policy and return
+        freed pages to the filesystem
+
+        The size limit evicts older versions of a result before the latest
+        version of any result, least recently accessed first.
+
+        Args:
+            keep_id: Version that must not be evicted (the one just saved)
+
+        Returns:
+            Number of evicted versions
+
+        >>> import tempfile
+        >>> store = ResultStore(os.path.join(tempfile.mkdtemp(), 'results.db'), max_versions=2)
+        >>> for body in ['a0', 'a1', 'a2']:
+        ...     _ = store.save_result('a_계약서_결과.md', 'a.pdf', '계약서', body, [])
+        >>> _ = store.save_result('b_계약서_결과.md', 'b.pdf', '계약서', 'b0', [])
+        >>> def versions():
+        ...     with store._connect() as conn:
+        ...         rows = conn.execute("SELECT id, result_name FROM documents ORDER BY id").fetchall()
+        ...     return [(row["id"], row["result_name"][0]) for row in rows]
+        >>> versions()  # 이름별로 최신 2개만 유지
+        [(2, 'a'), (3, 'a'), (4, 'b')]
+
+        Shrinking the size limit by one byte evicts the older "a" version
+        first, even though "b" was accessed less recently:
+
+        >>> with store._connect() as conn:
+        ...     _ = conn.execute("UPDATE documents SET accessed_at = 0 WHERE id = 4")
+        ...     total = conn.execute("SELECT SUM(stored_size) FROM documents").fetchone()[0]
+        >>> store.max_total_bytes = total - 1
+        >>> store.enforce_retention()
+        1
+        >>> versions()
+        [(3, 'a'), (4, 'b')]
+
+        A version that is just saved survives even a limit it exceeds on
+        its own:
+
+        >>> store.max_total_bytes = 1
+        >>> store.save_result('c_계약서_결과.md', 'c.pdf', '계약서', 'c0', [])["id"]
+        5
+        >>> versions()
+        [(5, 'c')]
+        >>> store.get_content('c_계약서_결과.md')[0]
+        b'c0'
+        """
+        evicted = 0
+        with self._connect() as conn:
+            # 이름별로 최신 max_versions 개만 유지
+            evicted += conn.execute(
+                "DELETE FROM documents WHERE id IN ("
+                " SELECT id FROM ("
+                "  SELECT id, ROW_NUMBER() OVER ("
+                "   PARTITION BY result_name ORDER BY created_at DESC, id DESC) AS version"
+                "  FROM documents)"
+                " WHERE version > ?)",
+                (self.max_versions,)
+            ).rowcount
+
+            if self.max_age_days is not None:
+                cutoff = time.time() - self.max_age_days * 86400
+                evicted += conn.execute(
+                    "DELETE FROM documents WHERE created_at < ? AND id IS NOT ?", (cutoff, keep_id)
+                ).rowcount
+
+            if self.max_total_bytes is not None:
+                total = conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM documents").fetchone()[0]
+                # 이전 버전부터, 그 안에서는 오래 접근하지 않은 순서로 삭제
+                rows = conn.execute(
+                    "SELECT id, stored_size FROM ("
+                    " SELECT id, stored_size, accessed_at, ROW_NUMBER() OVER ("
+                    "  PARTITION BY result_name ORDER BY created_at DESC, id DESC) = 1 AS is_latest"
+                    " FROM documents)"
+                    " WHERE id IS NOT ?"
+                    " ORDER BY is_latest ASC, accessed_at ASC, id ASC",
+                    (keep_id,)
+                ).fetchall()
+                for row in rows:
+                    if total <= self.max_total_bytes:
+                        break
+                    conn.execute("DELETE FROM documents WHERE id = ?", (row["id"],))
+                    total -= row["stored_size"]
+                    evicted += 1
+
+        if evicted:
+            # execute() 는 한 단계만 실행해서 한 페이지만 반환되므로 executescript 로 끝까지 실행
+            with self._connect() as conn:
+                conn.executescript("PRAGMA incremental_vacuum;")
+        return evicted